@@ -14,10 +14,71 @@ import sys
 # Allow importing the backend package from the project root
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import orjson
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
 from backend.graph_logic import TemporalGraph
 
+
+class OrjsonProvider(JSONProvider):
+    """Route request.get_json() and jsonify() through orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_folder="../public", static_url_path="/")
+app.json = OrjsonProvider(app)
+
+
+def _stream_cytoscape(diff):
+    """Stream a differential / static expansion as Cytoscape.js JSON.
+
+    Elements are written as pre-formatted JSON fragments instead of
+    building a {"data": {...}} dict per node and edge.  Everything
+    that can fail (JSON encoding) runs before the generator is
+    returned, so errors surface before headers are sent.
+    """
+    # Each time-vertex id is encoded once and shared by every edge
+    # that references it.
+    vid = {node: orjson.dumps(f"{node[0]}_t{node[1]}") for node in diff["nodes"]}
+    node_frags = [
+        (vid[(node_id, time)], orjson.dumps(f"v{node_id}"),
+         orjson.dumps(node_id), time)
+        for node_id, time in diff["nodes"]
+    ]
+    # Every edge endpoint is a node: TemporalGraph rejects edges whose
+    # endpoints are not in its vertex list, so vid[...] cannot miss.
+    edge_groups = ((b"b", b"black", diff["black_edges"]),
+                   (b"r", b"red", diff["red_edges"]))
+    stats = orjson.dumps({
+        "num_nodes": len(diff["nodes"]),
+        "num_black_edges": len(diff["black_edges"]),
+        "num_red_edges": len(diff["red_edges"]),
+    })
+
+    def chunks():
+        yield b'{"nodes":['
+        for k, (node, label, vertex, time) in enumerate(node_frags):
+            yield b'%s{"data":{"id":%s,"label":%s,"vertex":%s,"time":%d}}' % (
+                b"," if k else b"", node, label, vertex, time,
+            )
+
+        yield b'],"edges":['
+        sep = b""
+        for prefix, kind, edges in edge_groups:
+            for i, (src, tgt) in enumerate(edges):
+                yield b'%s{"data":{"id":"%s_%d","source":%s,"target":%s,"type":"%s"}}' % (
+                    sep, prefix, i, vid[src], vid[tgt], kind,
+                )
+                sep = b","
+
+        yield b'],"stats":%s}' % stats
+
+    return chunks()
 
 
 # ---------- static serving (local dev) ----------
@@ -61,56 +122,16 @@ def differential():
     if not data or "graph" not in data:
         return jsonify({"error": "Request must include 'graph' data."}), 400
 
-    graph = TemporalGraph.from_dict(data["graph"])
     t = int(data.get("t", 0))
     delta = int(data.get("delta", 2))
 
     try:
-        diff = graph.compute_differential(t, delta)
+        graph = TemporalGraph.from_dict(data["graph"])
+        body = _stream_cytoscape(graph.compute_differential(t, delta))
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
 
-    # ---- Format for Cytoscape.js ----
-    cy_nodes = []
-    for node_id, time in diff["nodes"]:
-        cy_nodes.append({
-            "data": {
-                "id": f"{node_id}_t{time}",
-                "label": f"v{node_id}",
-                "vertex": node_id,
-                "time": time,
-            }
-        })
-
-    cy_edges = []
-    for i, (src, tgt) in enumerate(diff["black_edges"]):
-        cy_edges.append({
-            "data": {
-                "id": f"b_{i}",
-                "source": f"{src[0]}_t{src[1]}",
-                "target": f"{tgt[0]}_t{tgt[1]}",
-                "type": "black",
-            }
-        })
-    for i, (src, tgt) in enumerate(diff["red_edges"]):
-        cy_edges.append({
-            "data": {
-                "id": f"r_{i}",
-                "source": f"{src[0]}_t{src[1]}",
-                "target": f"{tgt[0]}_t{tgt[1]}",
-                "type": "red",
-            }
-        })
-
-    return jsonify({
-        "nodes": cy_nodes,
-        "edges": cy_edges,
-        "stats": {
-            "num_nodes": len(cy_nodes),
-            "num_black_edges": len(diff["black_edges"]),
-            "num_red_edges": len(diff["red_edges"]),
-        },
-    })
+    return app.response_class(body, mimetype="application/json")
 
 
 @app.route("/api/analyze", methods=["POST"])
@@ -120,34 +141,25 @@ def analyze():
     if not data or "graph" not in data:
         return jsonify({"error": "Request must include 'graph' data."}), 400
 
-    graph = TemporalGraph.from_dict(data["graph"])
+    try:
+        graph = TemporalGraph.from_dict(data["graph"])
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     t = int(data.get("t", 0))
     delta = int(data.get("delta", 2))
 
     twins = graph.find_eternal_twins()
 
-    max_deg = None
-    tw_current = None
-    try:
-        max_deg = graph.max_degree_differential(t, delta)
-        tw_current = graph.tree_width_of_differential(t, delta)
-    except ValueError:
-        pass
-
-    # Compute Delta-differential tree-width dtw_Delta(G)
-    dtw_result = None
-    try:
-        dtw_result = graph.differential_tree_width(delta)
-    except ValueError:
-        pass
+    # Max degree, tree-width of the current window and dtw_Delta(G)
+    stats = graph.analyze_all(t, delta)
 
     return jsonify({
         "eternal_twins": [{"u": u, "v": v} for u, v in twins],
         "num_eternal_twins": len(twins),
-        "max_degree_differential": max_deg,
-        "tw_current_differential": tw_current,
-        "dtw_delta": dtw_result["dtw"] if dtw_result else None,
-        "dtw_per_t": dtw_result["per_t"] if dtw_result else [],
+        "max_degree_differential": stats["max_deg"],
+        "tw_current_differential": stats["tw_current"],
+        "dtw_delta": stats["dtw"],
+        "dtw_per_t": stats["per_t"],
         "lifetime": graph.lifetime,
         "num_vertices": len(graph.vertices),
         "edge_counts_per_snapshot": graph.snapshot_edge_counts(),
@@ -162,53 +174,13 @@ def static_expansion():
     if not data or "graph" not in data:
         return jsonify({"error": "Request must include 'graph' data."}), 400
 
-    graph = TemporalGraph.from_dict(data["graph"])
-
     try:
-        diff = graph.compute_static_expansion()
+        graph = TemporalGraph.from_dict(data["graph"])
+        body = _stream_cytoscape(graph.compute_static_expansion())
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
 
-    cy_nodes = []
-    for node_id, time in diff["nodes"]:
-        cy_nodes.append({
-            "data": {
-                "id": f"{node_id}_t{time}",
-                "label": f"v{node_id}",
-                "vertex": node_id,
-                "time": time,
-            }
-        })
-
-    cy_edges = []
-    for i, (src, tgt) in enumerate(diff["black_edges"]):
-        cy_edges.append({
-            "data": {
-                "id": f"b_{i}",
-                "source": f"{src[0]}_t{src[1]}",
-                "target": f"{tgt[0]}_t{tgt[1]}",
-                "type": "black",
-            }
-        })
-    for i, (src, tgt) in enumerate(diff["red_edges"]):
-        cy_edges.append({
-            "data": {
-                "id": f"r_{i}",
-                "source": f"{src[0]}_t{src[1]}",
-                "target": f"{tgt[0]}_t{tgt[1]}",
-                "type": "red",
-            }
-        })
-
-    return jsonify({
-        "nodes": cy_nodes,
-        "edges": cy_edges,
-        "stats": {
-            "num_nodes": len(cy_nodes),
-            "num_black_edges": len(diff["black_edges"]),
-            "num_red_edges": len(diff["red_edges"]),
-        },
-    })
+    return app.response_class(body, mimetype="application/json")
 
 
 # ---------- local dev server ----------
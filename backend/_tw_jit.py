@@ -0,0 +1,57 @@
+"""
+numba-compiled min-degree tree-width heuristic.
+
+Imported lazily by graph_logic._tree_width; importing this module
+raises ImportError when numba is not installed.
+"""
+
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True)
+def _popcount64(x):
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + (
+        (x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+@numba.njit(cache=True)
+def min_degree_width_jit(adj):
+    """Compiled graph_logic._min_degree_width over a uint64[n, words] adjacency
+    whose row i is the bitmask of i split into 64-bit words, least
+    significant word first.  Picks the same vertices (lowest index
+    among those of minimum degree), so the widths are identical."""
+    n, words = adj.shape
+    deg = np.zeros(n, dtype=np.int64)
+    for v in range(n):
+        for w in range(words):
+            deg[v] += _popcount64(adj[v, w])
+    alive = np.ones(n, dtype=np.bool_)
+    one = np.uint64(1)
+    width = 0
+    for _ in range(n):
+        best = -1
+        best_deg = n + 1
+        for v in range(n):
+            if alive[v] and deg[v] < best_deg:
+                best = v
+                best_deg = deg[v]
+        alive[best] = False
+        if best_deg > width:
+            width = best_deg
+        best_word = best >> 6
+        best_bit = one << np.uint64(best & 63)
+        for a in range(n):
+            if (adj[best, a >> 6] >> np.uint64(a & 63)) & one:
+                d = 0
+                for w in range(words):
+                    adj[a, w] |= adj[best, w]
+                adj[a, a >> 6] &= ~(one << np.uint64(a & 63))
+                adj[a, best_word] &= ~best_bit
+                for w in range(words):
+                    d += _popcount64(adj[a, w])
+                deg[a] = d
+    return width
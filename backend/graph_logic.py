@@ -15,10 +15,73 @@ Key definitions from the paper:
   N_t(u) = N_t(v) in every snapshot (per the paper's phi_twins formula).
 """
 
-import networkx as nx
-import random
+import heapq
+import numpy as np
+from collections import defaultdict
 from itertools import combinations
 
+# Compiled tree-width kernel from _tw_jit: None until first use,
+# False when numba is not installed.  Loaded lazily because importing
+# numba costs more than the rest of the cold start.
+_jit_kernel = None
+
+
+def _popcount(mask):
+    """Number of set bits in a non-negative integer bitmask."""
+    return bin(mask).count("1")
+
+
+def _min_degree_width(adj):
+    """Tree-width upper bound from the min-degree elimination heuristic.
+
+    Args:
+        adj: list of integer bitmasks, adj[i] having bit j set iff i and
+             j are adjacent.  The list is modified in place.
+
+    Repeatedly eliminates a vertex of minimum degree, turning its
+    neighbourhood into a clique; the width is the largest degree seen
+    at elimination time.  Stale heap entries are skipped lazily.
+    """
+    heap = [(_popcount(row), i) for i, row in enumerate(adj)]
+    heapq.heapify(heap)
+    eliminated = [False] * len(adj)
+    width = 0
+    while heap:
+        deg, i = heapq.heappop(heap)
+        if eliminated[i] or deg != _popcount(adj[i]):
+            continue
+        eliminated[i] = True
+        width = max(width, deg)
+        nbrs = adj[i]
+        m = nbrs
+        while m:
+            low = m & -m
+            a = low.bit_length() - 1
+            m ^= low
+            adj[a] = (adj[a] | nbrs) & ~low & ~(1 << i)
+            heapq.heappush(heap, (_popcount(adj[a]), a))
+    return width
+
+
+def _tree_width(rows):
+    """Min-degree tree-width of bitmask rows, JIT-compiled when numba
+    is installed.  rows is modified in place by the Python fallback."""
+    global _jit_kernel
+    if _jit_kernel is None:
+        try:
+            from ._tw_jit import min_degree_width_jit as _jit_kernel
+        except ImportError:  # optional: use the pure-Python heuristic
+            _jit_kernel = False
+    if not _jit_kernel or not rows:
+        return _min_degree_width(rows)
+    words = (len(rows) + 63) // 64
+    low64 = (1 << 64) - 1
+    adj = np.array(
+        [[(row >> (64 * w)) & low64 for w in range(words)] for row in rows],
+        dtype=np.uint64,
+    )
+    return int(_jit_kernel(adj))
+
 
 class TemporalGraph:
     """A temporal graph storing a sequence of snapshot edge-sets over a
@@ -27,30 +90,167 @@ class TemporalGraph:
     def __init__(self, vertices=None, snapshots=None):
         """
         Args:
-            vertices: list of vertex ids (e.g. [0, 1, ..., n-1])
+            vertices: list of hashable vertex ids (e.g. [0, 1, ..., n-1])
             snapshots: list of edge-lists, one per time step.
-                       Each edge-list contains (u, v) tuples.
+                       Each edge-list contains (u, v) pairs; only the
+                       first two fields of each edge are used.
+
+        Edges are stored as int32 arrays of shape (E_t, 2) holding the
+        positions of their endpoints in `vertices`.
+
+        Raises:
+            ValueError: if an edge is malformed or has an endpoint that
+                        is not in `vertices`.
         """
+        self._edges = []
         self.vertices = vertices or []
         self.snapshots = snapshots or []
 
+    @property
+    def vertices(self):
+        """List of vertex ids."""
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices):
+        snapshots = self.snapshots
+        self._vertices = list(vertices)
+        try:
+            self._index = {v: i for i, v in enumerate(self._vertices)}
+        except TypeError:
+            raise ValueError("Vertex ids must be hashable.") from None
+        # Stored edges refer to vertex positions, so re-encode them.
+        self.snapshots = snapshots
+
+    @property
+    def snapshots(self):
+        """List of edge-lists of (u, v) vertex-id tuples, one per time
+        step.
+
+        Returns a freshly decoded copy on every access: mutating it does
+        not change the graph (assign to `snapshots` instead), and
+        indexing it in a loop decodes every snapshot each time -- use
+        snapshot_edges(t) for a single snapshot.
+        """
+        return [self.snapshot_edges(t) for t in range(self.lifetime)]
+
+    def snapshot_edges(self, t):
+        """Return a copy of E_t as a list of (u, v) vertex-id tuples."""
+        V = self._vertices
+        return [(V[iu], V[iv]) for iu, iv in self._edges[t].tolist()]
+
+    @snapshots.setter
+    def snapshots(self, snapshots):
+        self._set_edges([self._encode_edges(edges) for edges in snapshots])
+
+    def _set_edges(self, edges):
+        """Store already-encoded (E_t, 2) int32 position arrays."""
+        self._edges = edges
+        # Derived per-snapshot structures are only valid for the edge
+        # sets they were built from, so drop them on reassignment.
+        self._snap_cache = {}
+        self._adj_cache = None
+        self._deg_cache = None
+        self._diff_cache = {}
+        self._full_diff = None
+        self._tw_cache = {}
+
+    def _encode_edges(self, edges):
+        """Map an edge-list of vertex ids to an (E, 2) int32 array of
+        vertex positions.  Edges are undirected, so each pair is
+        normalised to (lower, higher) position and duplicates are
+        dropped; every consumer then sees the same simple edge set."""
+        index = self._index
+        # Positions are non-negative and < 2**31, so each normalised
+        # (lo, hi) pair packs into one int64 key; a set dedupes them in
+        # the same pass that maps ids to positions.
+        keys = set()
+        try:
+            for e in edges:
+                lo, hi = index[e[0]], index[e[1]]
+                if lo > hi:
+                    lo, hi = hi, lo
+                keys.add(lo << 32 | hi)
+        except KeyError as exc:
+            raise ValueError(
+                f"Edge endpoint {exc.args[0]!r} is not in vertices."
+            ) from None
+        except (TypeError, IndexError):
+            raise ValueError("Each edge must be a [u, v] pair.") from None
+        packed = np.fromiter(keys, dtype=np.int64, count=len(keys))
+        packed.sort()
+        arr = np.empty((len(packed), 2), dtype=np.int32)
+        arr[:, 0] = packed >> 32
+        arr[:, 1] = packed & 0xFFFFFFFF
+        return arr
+
     @property
     def lifetime(self):
         """tau: number of snapshots."""
-        return len(self.snapshots)
+        return len(self._edges)
 
     def get_snapshot_graph(self, t):
-        """Return snapshot G_t as a networkx Graph."""
+        """Return snapshot G_t as a networkx Graph.
+
+        The graph is built once per snapshot and cached; callers must
+        not mutate it.  None of the analysis methods use networkx, so it
+        is imported lazily here to keep it off the cold-start path.
+        """
+        if t in self._snap_cache:
+            return self._snap_cache[t]
+        import networkx as nx
+
         G = nx.Graph()
         G.add_nodes_from(self.vertices)
         if 0 <= t < self.lifetime:
-            G.add_edges_from(self.snapshots[t])
+            G.add_edges_from(self.snapshot_edges(t))
+        self._snap_cache[t] = G
         return G
 
+    def _adj_bitmasks(self):
+        """Return the adjacency of every snapshot as integer bitmasks.
+
+        adj[t][i] has bit j set iff vertices self.vertices[i] and
+        self.vertices[j] are adjacent in G_t, so N_t(u) = N_t(v) becomes
+        a single integer comparison.  Built once and cached.
+        """
+        if self._adj_cache is None:
+            adj = []
+            for edges in self._edges:
+                rows = [0] * len(self.vertices)
+                for iu, iv in edges.tolist():
+                    rows[iu] |= 1 << iv
+                    rows[iv] |= 1 << iu
+                adj.append(rows)
+            self._adj_cache = adj
+        return self._adj_cache
+
+    def _degrees(self):
+        """Return deg[t][i] = deg_t(self.vertices[i]) for every snapshot,
+        popcounted once from the bitmask adjacency and cached.  A
+        self-loop sets a vertex's own bit but contributes 2 to its
+        degree, so that bit is counted twice."""
+        if self._deg_cache is None:
+            self._deg_cache = [
+                [_popcount(row) + ((row >> i) & 1)
+                 for i, row in enumerate(adj_t)]
+                for adj_t in self._adj_bitmasks()
+            ]
+        return self._deg_cache
+
     # ------------------------------------------------------------------
     # Differential Operator  (Definition 1 from the paper)
     # ------------------------------------------------------------------
 
+    def _check_window(self, t, delta):
+        """Raise ValueError unless [t, t+delta-1] lies within the lifetime."""
+        if t < 0 or delta < 1 or t + delta - 1 >= self.lifetime:
+            raise ValueError(
+                f"Invalid window: t={t}, delta={delta}, "
+                f"lifetime={self.lifetime}. Need 0 <= t and "
+                f"t + delta - 1 < lifetime."
+            )
+
     def compute_differential(self, t, delta):
         """Compute the differential G_->^{t, Delta}.
 
@@ -62,34 +262,40 @@ class TemporalGraph:
         Black Edges: (u, time) -- (v, time)  if uv in E_{time}
         Red Edges:   (v, time) -> (v, time+1) for temporal continuity
 
+        The result is cached per (t, delta); callers must not mutate it.
+
         Returns:
             dict with keys 'nodes', 'black_edges', 'red_edges'
         """
-        if t < 0 or delta < 1 or t + delta - 1 >= self.lifetime:
-            raise ValueError(
-                f"Invalid window: t={t}, delta={delta}, "
-                f"lifetime={self.lifetime}. Need 0 <= t and "
-                f"t + delta - 1 < lifetime."
-            )
-
-        nodes = []
-        black_edges = []
-        red_edges = []
-
-        for time in range(t, t + delta):
-            # Time-vertices for this snapshot
-            for v in self.vertices:
-                nodes.append((v, time))
-
-            # Black edges: within-snapshot adjacency
-            G_t = self.get_snapshot_graph(time)
-            for u, v in G_t.edges():
-                black_edges.append(((u, time), (v, time)))
-
-            # Red edges: temporal continuity to next time step
-            if time < t + delta - 1:
-                for v in self.vertices:
-                    red_edges.append(((v, time), (v, time + 1)))
+        self._check_window(t, delta)
+        if t == 0 and delta == self.lifetime:
+            return self.compute_static_expansion()
+        if (t, delta) not in self._diff_cache:
+            self._diff_cache[(t, delta)] = self._build_diff(t, t + delta)
+        return self._diff_cache[(t, delta)]
+
+    def _build_diff(self, start, stop):
+        """Build the differential over snapshots start..stop-1 without
+        validating the window or consulting the caches."""
+        window = range(start, stop)
+
+        # Time-vertices for every snapshot in the window
+        nodes = [(v, time) for time in window for v in self.vertices]
+
+        # Black edges: within-snapshot adjacency
+        V = self.vertices
+        black_edges = [
+            ((V[iu], time), (V[iv], time))
+            for time in window
+            for iu, iv in self._edges[time].tolist()
+        ]
+
+        # Red edges: temporal continuity to next time step
+        red_edges = [
+            ((v, time), (v, time + 1))
+            for time in range(start, stop - 1)
+            for v in self.vertices
+        ]
 
         return {
             "nodes": nodes,
@@ -115,48 +321,67 @@ class TemporalGraph:
         Returns:
             list of (u, v) tuples
         """
-        twins = []
-        for u, v in combinations(self.vertices, 2):
-            is_twin = True
-            for t in range(self.lifetime):
-                G_t = self.get_snapshot_graph(t)
-                nu = set(G_t.neighbors(u))
-                nv = set(G_t.neighbors(v))
-                if nu != nv:
-                    is_twin = False
-                    break
-            if is_twin:
-                twins.append((u, v))
-        return twins
+        adj = self._adj_bitmasks()
+
+        # N_t(u) = N_t(v) for every t  <=>  u and v have the same tuple
+        # of snapshot bitmasks, so group vertices by that tuple: every
+        # pair inside a group is an eternal twin.
+        groups = defaultdict(list)
+        for i in range(len(self.vertices)):
+            groups[tuple(adj_t[i] for adj_t in adj)].append(i)
+
+        pairs = []
+        for group in groups.values():
+            pairs.extend(combinations(group, 2))
+        pairs.sort()
+        return [(self.vertices[i], self.vertices[j]) for i, j in pairs]
 
     # ------------------------------------------------------------------
     # Analysis helpers
     # ------------------------------------------------------------------
 
-    def _differential_as_nx(self, t, delta):
-        """Build the differential as a plain networkx Graph (both
-        black and red edges are undirected).  This is the static
-        expansion graph G_->^{t, Delta} used when computing
-        tree-width."""
-        diff = self.compute_differential(t, delta)
-        G = nx.Graph()
-        G.add_nodes_from(diff["nodes"])
-        G.add_edges_from(diff["black_edges"])
-        G.add_edges_from(diff["red_edges"])
-        return G
+    def _differential_bitmasks(self, t, delta):
+        """Build the differential G_->^{t, Delta} as bitmask adjacency
+        (black and red edges both undirected), for computing tree-width.
+
+        Time-vertex (self.vertices[i], time) gets bit (time - t) * |V| + i,
+        so each snapshot row is shifted into its own block of |V| bits.
+        """
+        adj = self._adj_bitmasks()
+        n = len(self.vertices)
+        rows = []
+        for k in range(delta):
+            shift = k * n
+            for i, row in enumerate(adj[t + k]):
+                bit = shift + i
+                mask = (row << shift) & ~(1 << bit)
+                if k > 0:
+                    mask |= 1 << (bit - n)
+                if k < delta - 1:
+                    mask |= 1 << (bit + n)
+                rows.append(mask)
+        return rows
+
+    def _cached_tree_width(self, rows):
+        """Min-degree tree-width of a differential given as bitmask rows,
+        memoised on the rows so that windows inducing the same graph
+        (e.g. repeated snapshot sequences) are solved once."""
+        key = tuple(rows)
+        if key not in self._tw_cache:
+            self._tw_cache[key] = _tree_width(rows)
+        return self._tw_cache[key]
 
     def tree_width_of_differential(self, t, delta):
         """Compute the tree-width of the differential G_->^{t, Delta}.
 
-        Uses the min-degree heuristic from networkx (upper bound that
-        is exact for many practical instances).
+        Uses the min-degree heuristic (upper bound that is exact for
+        many practical instances).
 
         Returns:
             int  -- tree-width of the differential
         """
-        G = self._differential_as_nx(t, delta)
-        tw, _ = nx.algorithms.approximation.treewidth_min_degree(G)
-        return tw
+        self._check_window(t, delta)
+        return self._cached_tree_width(self._differential_bitmasks(t, delta))
 
     def differential_tree_width(self, delta):
         """Compute the Delta-differential tree-width dtw_Delta(G).
@@ -173,37 +398,86 @@ class TemporalGraph:
             )
         per_t = []
         for t in range(self.lifetime - delta + 1):
-            tw = self.tree_width_of_differential(t, delta)
+            tw = self._cached_tree_width(self._differential_bitmasks(t, delta))
             per_t.append((t, tw))
         dtw = max(tw for _, tw in per_t) if per_t else 0
         return {"dtw": dtw, "per_t": per_t}
 
     def max_degree_differential(self, t, delta):
-        """Return the maximum degree in the differential graph."""
-        diff = self.compute_differential(t, delta)
-        degree = {node: 0 for node in diff["nodes"]}
-        for u, v in diff["black_edges"] + diff["red_edges"]:
-            degree[u] += 1
-            degree[v] += 1
-        return max(degree.values()) if degree else 0
+        """Return the maximum degree in the differential graph.
+
+        The degree of (v, time) is deg_time(v) plus one red edge to each
+        neighbouring time step inside the window, so it is read off the
+        cached snapshot degrees without materialising the differential.
+        """
+        self._check_window(t, delta)
+        deg = self._degrees()
+        last = t + delta - 1
+        max_deg = 0
+        for time in range(t, last + 1):
+            if deg[time]:
+                red = (time > t) + (time < last)
+                max_deg = max(max_deg, max(deg[time]) + red)
+        return max_deg
+
+    def analyze_all(self, t, delta):
+        """Compute every window statistic needed by /api/analyze in one
+        pass over the Delta-windows.
+
+        The full static expansion is built once as bitmask adjacency;
+        each window G_->^{t', Delta} is sliced out of it by shifting and
+        masking the rows of its time steps.
+
+        Returns:
+            dict with 'max_deg' and 'tw_current' for the window at t
+            (None if that window is invalid), and 'dtw' and 'per_t' as
+            in differential_tree_width (None and [] if delta is invalid)
+        """
+        result = {"max_deg": None, "tw_current": None, "dtw": None, "per_t": []}
+        if delta < 1 or delta > self.lifetime:
+            return result
+
+        n = len(self.vertices)
+        full = self._differential_bitmasks(0, self.lifetime)
+        window_mask = (1 << (delta * n)) - 1
+        per_t = []
+        for start in range(self.lifetime - delta + 1):
+            shift = start * n
+            rows = [(row >> shift) & window_mask
+                    for row in full[shift:shift + delta * n]]
+            tw = self._cached_tree_width(rows)
+            if start == t:
+                result["tw_current"] = tw
+            per_t.append((start, tw))
+
+        if 0 <= t <= self.lifetime - delta:
+            result["max_deg"] = self.max_degree_differential(t, delta)
+        result["dtw"] = max(tw for _, tw in per_t)
+        result["per_t"] = per_t
+        return result
 
     def snapshot_edge_counts(self):
         """Return the number of edges in each snapshot."""
-        return [len(edges) for edges in self.snapshots]
+        return [edges.shape[0] for edges in self._edges]
 
     def union_graph_edges(self):
         """Return the edge set of the union graph G_downarrow."""
-        all_edges = set()
-        for edges in self.snapshots:
-            for u, v in edges:
-                all_edges.add((min(u, v), max(u, v)))
-        return list(all_edges)
+        if not self._edges:
+            return []
+        all_edges = np.vstack(self._edges)
+        pairs = np.unique(np.stack([all_edges.min(axis=1),
+                                    all_edges.max(axis=1)], 1), axis=0)
+        V = self.vertices
+        return [(V[iu], V[iv]) for iu, iv in pairs.tolist()]
 
     def compute_static_expansion(self):
         """Compute the full static expansion graph G_-> over ALL
         snapshots [0, tau-1].  This is equivalent to
-        compute_differential(0, tau)."""
-        return self.compute_differential(0, self.lifetime)
+        compute_differential(0, tau), and is built once per instance."""
+        if self._full_diff is None:
+            self._check_window(0, self.lifetime)
+            self._full_diff = self._build_diff(0, self.lifetime)
+        return self._full_diff
 
     # ------------------------------------------------------------------
     # Random generation
@@ -212,24 +486,34 @@ class TemporalGraph:
     @staticmethod
     def generate_random(num_nodes=10, num_snapshots=5, edge_prob=0.2):
         """Generate a random temporal graph."""
-        vertices = list(range(num_nodes))
-        snapshots = []
+        graph = TemporalGraph(vertices=list(range(num_nodes)))
+        # One vectorised draw per snapshot over the upper triangle
+        # (u < v), in the same order as combinations(vertices, 2).
+        # Positions equal ids here and the pairs are already sorted and
+        # unique, so the arrays are stored without re-encoding.
+        iu, iv = np.triu_indices(num_nodes, k=1)
+        edges = []
         for _ in range(num_snapshots):
-            edges = []
-            for u, v in combinations(vertices, 2):
-                if random.random() < edge_prob:
-                    edges.append((u, v))
-            snapshots.append(edges)
-        return TemporalGraph(vertices=vertices, snapshots=snapshots)
+            hit = np.random.random(iu.shape[0]) < edge_prob
+            edges.append(np.column_stack((iu[hit], iv[hit])).astype(np.int32))
+        graph._set_edges(edges)
+        return graph
 
     # ------------------------------------------------------------------
     # Serialization
     # ------------------------------------------------------------------
 
     def to_dict(self):
+        V = self.vertices
+        if V == list(range(len(V))):
+            # Positions are the ids: emit the arrays as-is.
+            snapshots = [edges.tolist() for edges in self._edges]
+        else:
+            snapshots = [[[V[iu], V[iv]] for iu, iv in edges.tolist()]
+                         for edges in self._edges]
         return {
-            "vertices": self.vertices,
-            "snapshots": [list(edges) for edges in self.snapshots],
+            "vertices": V,
+            "snapshots": snapshots,
             "lifetime": self.lifetime,
         }
 
@@ -237,5 +521,5 @@ class TemporalGraph:
     def from_dict(cls, data):
         return cls(
             vertices=data["vertices"],
-            snapshots=[[(e[0], e[1]) for e in edges] for edges in data["snapshots"]],
+            snapshots=data["snapshots"],
         )
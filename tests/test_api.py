@@ -0,0 +1,94 @@
+"""
+Tests for the Flask endpoints that stream Cytoscape.js JSON.
+
+The differential and static-expansion bodies are written as raw byte
+fragments, so these parse them back and compare against the
+dict-per-element format the endpoints used to build with jsonify.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+
+from api.index import app
+from backend.graph_logic import TemporalGraph
+
+GRAPH = {
+    "vertices": [0, 1, 2, 3],
+    "snapshots": [[[0, 1], [1, 2]], [[0, 1], [2, 3]], [[1, 3]]],
+}
+
+
+def _cytoscape(diff):
+    """Reference formatter: one {"data": {...}} dict per element."""
+    def node_id(node):
+        return f"{node[0]}_t{node[1]}"
+
+    nodes = [{"data": {"id": node_id((v, t)), "label": f"v{v}",
+                       "vertex": v, "time": t}}
+             for v, t in diff["nodes"]]
+    edges = []
+    for prefix, kind in (("b", "black"), ("r", "red")):
+        for i, (src, tgt) in enumerate(diff[f"{kind}_edges"]):
+            edges.append({"data": {"id": f"{prefix}_{i}",
+                                   "source": node_id(src),
+                                   "target": node_id(tgt),
+                                   "type": kind}})
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "stats": {
+            "num_nodes": len(diff["nodes"]),
+            "num_black_edges": len(diff["black_edges"]),
+            "num_red_edges": len(diff["red_edges"]),
+        },
+    }
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.mark.parametrize("graph", [
+    GRAPH,
+    {"vertices": ["a", 'q"uote', "ü"],
+     "snapshots": [[["a", 'q"uote']], [["a", "ü"]]]},
+])
+def test_differential_streams_valid_json(client, graph):
+    r = client.post("/api/differential",
+                    json={"graph": graph, "t": 0, "delta": 2})
+    assert r.status_code == 200
+    expected = TemporalGraph.from_dict(graph).compute_differential(0, 2)
+    assert json.loads(r.data) == _cytoscape(expected)
+
+
+def test_static_expansion_streams_valid_json(client):
+    r = client.post("/api/static-expansion", json={"graph": GRAPH})
+    assert r.status_code == 200
+    expected = TemporalGraph.from_dict(GRAPH).compute_static_expansion()
+    assert json.loads(r.data) == _cytoscape(expected)
+
+
+def test_empty_graph_streams_valid_json(client):
+    r = client.post("/api/static-expansion",
+                    json={"graph": {"vertices": [], "snapshots": [[]]}})
+    assert json.loads(r.data) == {
+        "nodes": [], "edges": [],
+        "stats": {"num_nodes": 0, "num_black_edges": 0, "num_red_edges": 0},
+    }
+
+
+@pytest.mark.parametrize("url, body", [
+    ("/api/differential", {"graph": GRAPH, "t": 2, "delta": 2}),
+    ("/api/differential", {"graph": GRAPH, "t": -1, "delta": 1}),
+    ("/api/differential", {"graph": {"vertices": [0], "snapshots": [[[0, 5]]]}}),
+    ("/api/static-expansion", {"graph": {"vertices": [0], "snapshots": [[[0]]]}}),
+    ("/api/static-expansion", {}),
+])
+def test_invalid_requests_return_400(client, url, body):
+    r = client.post(url, json=body)
+    assert r.status_code == 400
+    assert "error" in json.loads(r.data)
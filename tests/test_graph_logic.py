@@ -0,0 +1,103 @@
+"""
+Tests for TemporalGraph edge storage: vertex-id encoding, validation
+and de-duplication of imported snapshots.
+"""
+
+import pytest
+
+from backend.graph_logic import TemporalGraph
+
+
+def test_from_dict_round_trip_with_string_ids():
+    data = {
+        "vertices": ["a", "b", "c"],
+        "snapshots": [[["a", "b"]], [["a", "c"], ["b", "c"]]],
+    }
+    graph = TemporalGraph.from_dict(data)
+    assert graph.to_dict() == {**data, "lifetime": 2}
+    assert graph.snapshot_edges(1) == [("a", "c"), ("b", "c")]
+    assert graph.compute_differential(0, 1)["black_edges"] == [
+        (("a", 0), ("b", 0)),
+    ]
+
+
+def test_large_and_negative_ids():
+    graph = TemporalGraph.from_dict({
+        "vertices": [-3, 0, 2**40],
+        "snapshots": [[[-3, 2**40], [0, -3]]],
+    })
+    assert graph.snapshot_edges(0) == [(-3, 0), (-3, 2**40)]
+    assert sorted(graph.union_graph_edges()) == [(-3, 0), (-3, 2**40)]
+
+
+def test_only_first_two_edge_fields_are_used():
+    graph = TemporalGraph.from_dict({
+        "vertices": [0, 1, 2],
+        "snapshots": [[[0, 1, 5], [2, 1, 7]]],
+    })
+    assert graph.snapshot_edges(0) == [(0, 1), (1, 2)]
+
+
+@pytest.mark.parametrize("vertices, edges, message", [
+    ([0, 1], [[0, 9]], "not in vertices"),
+    ([0, 1], [[0]], r"\[u, v\] pair"),
+    ([0, 1], [5], r"\[u, v\] pair"),
+    ([[0], [1]], [], "hashable"),
+])
+def test_invalid_input_raises_value_error(vertices, edges, message):
+    with pytest.raises(ValueError, match=message):
+        TemporalGraph.from_dict({"vertices": vertices, "snapshots": [edges]})
+
+
+def test_duplicate_edges_collapse():
+    graph = TemporalGraph.from_dict({
+        "vertices": [0, 1, 2],
+        "snapshots": [[[0, 1], [1, 0], [1, 2], [0, 1]]],
+    })
+    assert graph.snapshot_edge_counts() == [2]
+    assert graph.snapshot_edges(0) == [(0, 1), (1, 2)]
+    assert len(graph.compute_differential(0, 1)["black_edges"]) == 2
+    assert graph.max_degree_differential(0, 1) == 2
+
+
+def test_self_loop_counts_twice_in_degree():
+    graph = TemporalGraph.from_dict({
+        "vertices": [0, 1],
+        "snapshots": [[[0, 0]], [[0, 0], [0, 1]]],
+    })
+    assert graph.compute_differential(0, 1)["black_edges"] == [
+        ((0, 0), (0, 0)),
+    ]
+    assert graph.max_degree_differential(0, 1) == 2
+    assert graph.max_degree_differential(1, 1) == 3
+    assert graph.max_degree_differential(0, 2) == 4
+    assert graph.analyze_all(0, 2)["max_deg"] == 4
+
+
+def test_union_graph_edges():
+    graph = TemporalGraph.from_dict({
+        "vertices": [0, 1, 2, 3],
+        "snapshots": [[[1, 0], [2, 3]], [[0, 1], [3, 1]], []],
+    })
+    assert sorted(graph.union_graph_edges()) == [(0, 1), (1, 3), (2, 3)]
+    assert TemporalGraph(vertices=[0]).union_graph_edges() == []
+
+
+def test_reassigning_vertices_reencodes_edges():
+    graph = TemporalGraph(vertices=["a", "b", "c"], snapshots=[[("a", "b")]])
+    graph.find_eternal_twins()  # populate the bitmask cache
+    graph.vertices = ["c", "b", "a"]
+    assert graph.snapshot_edges(0) == [("b", "a")]
+    assert graph.find_eternal_twins() == []
+    with pytest.raises(ValueError):
+        graph.vertices = ["a"]
+
+
+def test_generate_random_round_trip():
+    graph = TemporalGraph.generate_random(12, 4, 0.5)
+    copy = TemporalGraph.from_dict(graph.to_dict())
+    assert copy.to_dict() == graph.to_dict()
+    for t in range(graph.lifetime):
+        edges = graph.snapshot_edges(t)
+        assert edges == sorted(set(edges))
+        assert all(u < v for u, v in edges)
@@ -0,0 +1,88 @@
+"""
+Tests for the bitmask min-degree tree-width heuristic.
+
+The heuristic replaced networkx's treewidth_min_degree, so these pin
+its exact behaviour: eliminate the lowest-index vertex of minimum
+degree, fill in its neighbourhood, report the largest degree seen.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from backend import graph_logic
+from backend.graph_logic import TemporalGraph, _min_degree_width
+
+
+def _random_rows(rng, n, p):
+    rows = [0] * n
+    for i in range(n):
+        for j in range(i + 1, n):
+            if rng.random() < p:
+                rows[i] |= 1 << j
+                rows[j] |= 1 << i
+    return rows
+
+
+def _reference_width(rows):
+    """Brute-force lowest-index min-degree elimination on sets."""
+    nbrs = {i: {j for j in range(len(rows)) if (rows[i] >> j) & 1}
+            for i in range(len(rows))}
+    width = 0
+    while nbrs:
+        v = min(nbrs, key=lambda u: (len(nbrs[u]), u))
+        width = max(width, len(nbrs[v]))
+        for a in nbrs[v]:
+            nbrs[a] |= nbrs[v] - {a}
+            nbrs[a].discard(v)
+        del nbrs[v]
+    return width
+
+
+def test_min_degree_width_matches_reference():
+    rng = random.Random(0)
+    for _ in range(300):
+        rows = _random_rows(rng, rng.randint(0, 40), rng.random() * 0.5)
+        assert _min_degree_width(list(rows)) == _reference_width(rows)
+
+
+def test_min_degree_width_known_graphs():
+    def clique(n):
+        return [((1 << n) - 1) & ~(1 << i) for i in range(n)]
+
+    def cycle(n):
+        return [(1 << ((i - 1) % n)) | (1 << ((i + 1) % n)) for i in range(n)]
+
+    assert _min_degree_width([]) == 0
+    assert _min_degree_width([0, 0, 0]) == 0
+    assert _min_degree_width(clique(6)) == 5
+    assert _min_degree_width(cycle(7)) == 2
+
+
+def test_differential_tree_width_of_empty_graph():
+    graph = TemporalGraph(vertices=[], snapshots=[[], []])
+    assert graph.differential_tree_width(2) == {"dtw": 0, "per_t": [(0, 0)]}
+
+
+def test_jit_kernel_matches_python_heuristic():
+    pytest.importorskip("numba")
+    from backend._tw_jit import min_degree_width_jit
+
+    rng = random.Random(1)
+    for _ in range(300):
+        # Up to 150 vertices so rows span several 64-bit words.
+        rows = _random_rows(rng, rng.randint(1, 150), rng.random() * 0.2)
+        words = (len(rows) + 63) // 64
+        adj = [[(row >> (64 * w)) & ((1 << 64) - 1) for w in range(words)]
+               for row in rows]
+        jit = int(min_degree_width_jit(np.array(adj, dtype=np.uint64)))
+        assert jit == _min_degree_width(list(rows))
+
+
+def test_tree_width_fallback_without_numba(monkeypatch):
+    monkeypatch.setattr(graph_logic, "_jit_kernel", False)
+    rng = random.Random(2)
+    for _ in range(50):
+        rows = _random_rows(rng, rng.randint(0, 30), 0.3)
+        assert graph_logic._tree_width(list(rows)) == _reference_width(rows)